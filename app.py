@@ -1,28 +1,21 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from io import BytesIO
 import numpy as np
-import time
 
 # Streamlit app configuration
 st.set_page_config(page_title="🌌 Financial Data Sweeper", layout="wide", page_icon="🚀")
 st.title("🌠 Financial Data Sweeper V4.0")
 
-# Enhanced Light Theme Styling with a refined cosmic twist
-st.markdown(
-    """
+# Enhanced Light Theme Styling with a refined cosmic twist.
+# Kept as one module-level constant; it is still emitted on every run because
+# Streamlit drops any element a rerun does not re-emit.
+CSS = """
     <style>
         @keyframes fadeIn {
             from { opacity: 0; transform: translateY(20px); }
             to { opacity: 1; transform: translateY(0); }
         }
-        @keyframes glow {
-            0% { box-shadow: 0 0 5px #a1c4fd, 0 0 10px #c3e0ff; }
-            50% { box-shadow: 0 0 15px #a1c4fd, 0 0 20px #c3e0ff; }
-            100% { box-shadow: 0 0 5px #a1c4fd, 0 0 10px #c3e0ff; }
-        }
         @keyframes float {
             0% { transform: translateY(0); }
             50% { transform: translateY(-10px); }
@@ -105,9 +98,8 @@ st.markdown(
             box-shadow: 0 1px 5px rgba(0, 0, 0, 0.02);
         }
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+st.markdown(CSS, unsafe_allow_html=True)
 
 # Sidebar
 st.sidebar.header("🌌 Data Nexus")
@@ -122,67 +114,305 @@ if uploaded_file:
 else:
     st.sidebar.info("🌀 Awaiting cosmic data...")
 
-# Cached data loading
-@st.cache_data
-def load_data(file):
-    return pd.read_csv(file) if file.name.endswith(".csv") else pd.read_excel(file)
+# Cached data loading (keyed on the upload's bytes and format)
+@st.cache_data(max_entries=4)
+def load_data(file_bytes, is_csv):
+    if is_csv:
+        try:
+            # strings_can_be_null makes empty and NA text cells missing values, as pandas' read_csv does
+            table = pacsv.read_csv(
+                BytesIO(file_bytes),
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+                convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+            )
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        except pa.ArrowInvalid:
+            # pyarrow is strict about ragged rows and mixed column types; pandas' parser is more forgiving
+            df = pd.read_csv(BytesIO(file_bytes))
+    else:
+        df = pd.read_excel(BytesIO(file_bytes), engine="calamine")
+    return downcast(df)
 
-# Data cleaning function
-def clean_data(df, method="drop"):
+# Shrink the frame: smallest integer type for ints, category for repetitive text.
+# Floats stay float64 so exports and the statistics shown next to them keep full precision.
+def downcast(df):
+    # pyarrow types an all-empty column as null; make it a float64 NaN column, as pandas' read_csv does,
+    # so it stays numeric for the fills, pickers and summary
+    null_cols = [col for col, dtype in df.dtypes.items() if isinstance(dtype, pd.ArrowDtype) and pa.types.is_null(dtype.pyarrow_dtype)]
+    df[null_cols] = df[null_cols].astype(np.float64)
+    int_cols = df.select_dtypes(include=['integer']).columns
+    df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast='integer')
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        if df[col].nunique() <= len(df) // 2:
+            df[col] = df[col].astype('category')
+    return df
+
+# Data cleaning function (cached on the upload's bytes and format, so the parsed frame is never hashed)
+@st.cache_data(max_entries=4)
+def clean_data(file_bytes, is_csv, method="drop"):
+    df = load_data(file_bytes, is_csv)
+    numeric_cols = numeric_columns_of(df)
+    if method in ("mean", "median"):
+        # Integer columns can't hold a fractional mean/median, so ones with gaps become float64 before the fill
+        gappy_int_cols = [col for col in numeric_cols if pd.api.types.is_integer_dtype(df[col]) and df[col].hasnans]
+        df[gappy_int_cols] = df[gappy_int_cols].astype(np.float64)
     if method == "drop":
-        return df.dropna().drop_duplicates()
+        return drop_duplicate_rows(df.iloc[df.notna().all(axis=1).to_numpy()])
     elif method == "mean":
-        numeric_cols = df.select_dtypes(include=['number']).columns
         df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].mean())
-        return df.drop_duplicates()
+        return drop_duplicate_rows(df)
     elif method == "median":
-        numeric_cols = df.select_dtypes(include=['number']).columns
         df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
-        return df.drop_duplicates()
+        return drop_duplicate_rows(df)
     elif method == "zero":
-        numeric_cols = df.select_dtypes(include=['number']).columns
         df[numeric_cols] = df[numeric_cols].fillna(0)
-        return df.drop_duplicates()
+        return drop_duplicate_rows(df)
+
+# Duplicate removal from one 64-bit hash per row (keeps first occurrences, like drop_duplicates)
+def drop_duplicate_rows(df):
+    # hash_pandas_object hashes object/category values as str, so 1001 and '1001' would collide;
+    # columns mixing Python types go through drop_duplicates, which compares the values themselves
+    for col in df.select_dtypes(include=['object', 'category']).columns:
+        values = df[col].cat.categories if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].dropna()
+        if values.map(type).nunique() > 1:
+            return df.drop_duplicates()
+    # -0.0 == 0.0 but the two hash differently; adding 0.0 turns every -0.0 into 0.0 before hashing
+    keys = df.copy(deep=False)
+    float_cols = keys.select_dtypes(include=['float']).columns
+    keys[float_cols] = keys[float_cols] + 0.0
+    _, first = np.unique(pd.util.hash_pandas_object(keys, index=False).to_numpy(), return_index=True)
+    return df.iloc[np.sort(first)]
+
+# Cached numeric column lookup (keyed on column names and dtypes only)
+@st.cache_data(hash_funcs={pd.DataFrame: lambda d: tuple((c, str(t)) for c, t in d.dtypes.items())})
+def numeric_columns_of(df):
+    return list(df.select_dtypes(include=['number']).columns)
+
+# Summary statistics: same layout as describe(), but min/quartiles/max come from one percentile pass.
+# Cached on the upload, format and cleaning method (Streamlit only samples large arrays when hashing them).
+@st.cache_data(max_entries=4)
+def summarize(file_bytes, is_csv, method):
+    df = clean_data(file_bytes, is_csv, method=method)
+    columns = numeric_columns_of(df)
+    arr = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    if arr.shape[0] == 0:
+        # nanpercentile rejects an empty axis; describe() reports a zero count and NaN for the rest
+        stats = np.full((8, arr.shape[1]), np.nan)
+        stats[0] = 0
+    else:
+        stats = np.vstack([
+            np.count_nonzero(~np.isnan(arr), axis=0),
+            np.nanmean(arr, axis=0),
+            np.nanstd(arr, axis=0, ddof=1),
+            np.nanpercentile(arr, [0, 25, 50, 75, 100], axis=0),
+        ])
+    return pd.DataFrame(stats, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"], columns=columns)
+
+# Correlation matrix as one float32 GEMM on the standardized block, cached on the upload, format and cleaning method
+@st.cache_data(max_entries=4)
+def correlation_matrix(file_bytes, is_csv, method):
+    df = clean_data(file_bytes, is_csv, method=method)
+    columns = numeric_columns_of(df)
+    arr = df[columns].to_numpy(dtype=np.float32, na_value=np.nan)
+    arr = arr - arr.mean(axis=0)
+    std = arr.std(axis=0)
+    std[std == 0] = np.nan  # constant columns correlate as NaN, like DataFrame.corr
+    arr /= std
+    corr = np.clip((arr.T @ arr) / arr.shape[0], -1.0, 1.0)
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+# Histogram bins and box-plot statistics computed server-side, so the browser gets O(bins) numbers, not O(N).
+# Cached on the upload, format, cleaning method and column rather than the column's values.
+@st.cache_data(max_entries=16)
+def distribution_stats(file_bytes, is_csv, method, column, nbins=50):
+    arr = clean_data(file_bytes, is_csv, method=method)[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    arr = arr[np.isfinite(arr)]  # NaN and inf (both parse from CSV) can't be binned
+    if arr.size == 0:
+        # Empty frame or no finite values: nothing to bin, no quartiles
+        return np.zeros(0, dtype=np.int64), np.zeros(0), (np.nan,) * 5
+    counts, edges = np.histogram(arr, bins=nbins)
+    q1, median, q3 = np.quantile(arr, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    lowerfence = arr[arr >= q1 - 1.5 * iqr].min()
+    upperfence = arr[arr <= q3 + 1.5 * iqr].max()
+    return counts, edges, (q1, median, q3, lowerfence, upperfence)
+
+# Trend downsampling: MinMax-LTTB keeps ~n_out visually faithful points of a long series
+def downsample_trend(values, n_out=2000):
+    if len(values) <= n_out:
+        return values
+    y = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values.iloc[MinMaxLTTBDownsampler().downsample(y, n_out=n_out)]
+
+# Figure builders: st.cache_resource hands back the same Figure object, so reruns skip construction and pickling
+@st.cache_resource(max_entries=8)
+def build_corr_fig(corr_matrix):
+    fig = px.imshow(corr_matrix, text_auto=True, title="Correlation Map", color_continuous_scale="Blues")
+    fig.update_layout(hovermode="x unified", font=dict(color="#1e2a44"))
+    return fig
+
+@st.cache_resource(max_entries=8)
+def build_distribution_fig(column, counts, edges, box_stats, trend_values):
+    q1, median, q3, lowerfence, upperfence = box_stats
+    fig = make_subplots(
+        rows=1, cols=3,
+        subplot_titles=(f"📊 {column} Nebula Histogram", f"📦 {column} Quantum Flux", f"📈 {column} Temporal Rift")
+    )
+    traces, cols = [], []
+    if counts.size:  # an empty or all-NaN column gets no bars and no box
+        traces += [
+            go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, marker_color="#a1c4fd", name="Histogram"),
+            go.Box(
+                q1=[q1], median=[median], q3=[q3], lowerfence=[lowerfence], upperfence=[upperfence],
+                marker_color="#c3e0ff", name=column
+            )
+        ]
+        cols += [1, 2]
+    traces.append(go.Scattergl(x=trend_values.index, y=trend_values, mode="lines+markers", line_color="#ffcc99", marker_color="#ffcc99", name="Trend"))
+    cols.append(3)
+    # One add_traces call validates and lays out all the traces together
+    fig.add_traces(traces, rows=[1] * len(traces), cols=cols)
+    fig.update_layout(bargap=0.1, showlegend=False, font=dict(color="#1e2a44"))
+    return fig
 
 # Outlier detection
 def detect_outliers(df, column):
-    Q1 = df[column].quantile(0.25)
-    Q3 = df[column].quantile(0.75)
+    values = df[column]
+    Q1, Q3 = values.quantile([0.25, 0.75])
     IQR = Q3 - Q1
     lower_bound = Q1 - 1.5 * IQR
     upper_bound = Q3 + 1.5 * IQR
-    outliers = df[(df[column] < lower_bound) | (df[column] > upper_bound)][column]
+    outliers = values[(values < lower_bound) | (values > upper_bound)]
     return outliers
 
+# Arrow table for export. Arrow needs one type per column, so text columns holding mixed values
+# (e.g. 1 and 'x4' from an Excel sheet) are written as strings, with missing cells left missing.
+def to_arrow_table(df):
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for col in df.select_dtypes(include=['object', 'category']).columns:
+            values = df[col].astype(object)
+            df[col] = values.where(values.isna(), values.astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
 # Data export
 def convert_df(df, format="csv"):
     if format == "csv":
+        # pyarrow's multithreaded writer streams through gzip into one Arrow buffer; CSV shrinks ~5-10x on the wire
+        output = pa.BufferOutputStream()
+        with pa.CompressedOutputStream(output, "gzip") as gz:
+            pacsv.write_csv(to_arrow_table(df), gz)
+        return output.getvalue().to_pybytes()
+    elif format == "parquet":
         output = BytesIO()
-        df.to_csv(output, index=False)
+        pq.write_table(to_arrow_table(df), output, compression="zstd")
         return output.getvalue()
     elif format == "excel":
+        # constant_memory flushes each row to disk as soon as the next one starts. pandas' to_excel
+        # writes column by column (constant_memory would drop all but the last column), so write rows here.
         output = BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, index=False)
-        output.seek(0)
-        return output.read()
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm:ss', 'remove_timezone': True})
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, [str(c) for c in df.columns], workbook.add_format({'bold': True}))
+        for r, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            worksheet.write_row(r, 0, [None if pd.isna(v) else v.item() if isinstance(v, np.generic) else v for v in row])
+        workbook.close()
+        return output.getvalue()
+
+# Cached export, keyed on the upload, cleaning method and format (never on the cleaned frame)
+@st.cache_data(show_spinner=False, max_entries=2)
+def export_cleaned(file_bytes, is_csv, method, format="csv"):
+    return convert_df(clean_data(file_bytes, is_csv, method=method), format=format)
+
+# Visualization section. As an st.fragment, changing its widgets reruns only this block,
+# not the load/clean/summary/export steps above and below it.
+@st.fragment
+def visualizations(df_cleaned, numeric_columns, file_bytes, is_csv, method):
+    try:
+        st.subheader("🌌 Galactic Visualizations")
+        selected_column = st.selectbox("Select data singularity", numeric_columns, key="selected_column")
+
+        # Histogram, box plot and trend line share one figure: one payload, one render
+        values = df_cleaned[selected_column]
+        counts, edges, box_stats = distribution_stats(file_bytes, is_csv, method, selected_column)
+        q1, median, q3, _, _ = box_stats
+        fig = build_distribution_fig(selected_column, counts, edges, box_stats, downsample_trend(values))
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Scatter plot
+        if st.checkbox("Engage Scatter Warp"):
+            x_col = st.selectbox("X-axis singularity", numeric_columns)
+            y_col = st.selectbox("Y-axis singularity", numeric_columns, index=1)
+            fig = px.scatter(
+                df_cleaned, x=x_col, y=y_col, title=f"Warp Field: {x_col} vs {y_col}", 
+                color_discrete_sequence=["#c3e0ff"], 
+                animation_frame=None if 'Date' not in df_cleaned.columns else 'Date',
+                render_mode="webgl"
+            )
+            fig.update_layout(font=dict(color="#1e2a44"))
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Outlier detection
+        if st.checkbox("Probe for Cosmic Anomalies"):
+            outliers = detect_outliers(df_cleaned, selected_column)
+            st.write(f"Anomalies in {selected_column}:")
+            if not outliers.empty:
+                st.write(outliers)
+            else:
+                st.write("No anomalies detected in this singularity.")
+
+        # Quartile visualization
+        st.subheader("📊 Stellar Quartile Array")
+        q2 = median  # quartiles come from the cached distribution_stats above
+        fig = go.Figure(
+            data=[go.Bar(
+                x=["Q1", "Q2 (Core)", "Q3"], y=[q1, q2, q3], 
+                marker_color=["#a1c4fd", "#ffcc99", "#c3e0ff"], 
+                text=[f"{q1:.2f}", f"{q2:.2f}", f"{q3:.2f}"], textposition="auto"
+            )],
+            layout=dict(title=f"Quartile Array for {selected_column}", font=dict(color="#1e2a44"))
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        # AI Integration (inside the fragment so it follows the selected column on fragment reruns)
+        with st.expander("🤖 AI Core", expanded=False):
+            question = st.text_input("Query the neural core (e.g., 'What’s the trend in this singularity?')")
+            if question:
+                with st.spinner("🤖 Neural net engaging..."):
+                    trend = "rising" if values.iloc[-1] > values.iloc[0] else "falling" if values.iloc[-1] < values.iloc[0] else "stable"
+                st.write(f"🧠 Response (Feb 24, 2025): Analyzing '{question}'. For {selected_column}, the temporal rift suggests a {trend} trend based on recent data shifts.")
+    except Exception as e:
+        st.error(f"❌ Hyperdrive malfunction: {e}")
 
 if uploaded_file:
+    # Plotting, parsing, export and downsampling libraries are only needed once data is loaded;
+    # keep them off the no-upload rerun path
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    import plotly.io as pio
+    pio.json.config.default_engine = "orjson"  # serializes numpy arrays directly in st.plotly_chart
+    pio.templates.default = "plotly_white"  # set once instead of passing template= to every figure
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    import xlsxwriter
+    from tsdownsample import MinMaxLTTBDownsampler
+
     try:
-        # Loading animation
-        progress_bar = st.progress(0)
+        # Loading indicator (only shown while the file is actually being parsed)
+        file_bytes = uploaded_file.getvalue()
+        is_csv = uploaded_file.name.lower().endswith(".csv")
         with st.spinner("🌌 Engaging hyperdrive..."):
-            df = load_data(uploaded_file)
-            for i in range(100):
-                progress_bar.progress(i + 1)
-                time.sleep(0.01)
-            progress_bar.empty()
+            df = load_data(file_bytes, is_csv)
         
         st.success("✨ Data hyperspace jump complete!")
         
         # Raw data display
         st.subheader("📜 Cosmic Raw Data")
-        st.dataframe(df.style.applymap(lambda x: "background-color: rgba(245, 250, 255, 0.7);"), use_container_width=True, height=400)
+        st.dataframe(df, use_container_width=True, height=400)
         
         # Data cleaning
         cleaning_method = st.selectbox("🧠 Data Flux Purification", ["Purge Anomalies", "Mean Convergence", "Median Stabilization", "Zero Flux"])
@@ -192,106 +422,44 @@ if uploaded_file:
             "Median Stabilization": "median",
             "Zero Flux": "zero"
         }
-        df_cleaned = clean_data(df, method=cleaning_method_map[cleaning_method])
+        method = cleaning_method_map[cleaning_method]
+        df_cleaned = clean_data(file_bytes, is_csv, method=method)
         
         st.subheader("✨ Stabilized Data Core")
-        st.dataframe(df_cleaned.style.applymap(lambda x: "background-color: rgba(245, 250, 255, 0.7);"), use_container_width=True, height=400)
+        st.dataframe(df_cleaned, use_container_width=True, height=400)
+        
+        numeric_columns = numeric_columns_of(df_cleaned)
         
         # Summary stats
         with st.expander("📊 Quantum Data Insights", expanded=False):
             st.write("Analyzing data dimensions:")
-            st.write(df_cleaned.describe().style.background_gradient(cmap="Blues"))
+            summary = summarize(file_bytes, is_csv, method) if numeric_columns else df_cleaned.describe()
+            st.dataframe(summary, use_container_width=True)
         
         # Correlation heatmap
-        numeric_columns = df_cleaned.select_dtypes(include=['number']).columns
-        if not numeric_columns.empty:
+        if numeric_columns:
             st.subheader("🔥 Interstellar Correlation Map")
-            corr_matrix = df_cleaned[numeric_columns].corr()
-            fig = px.imshow(corr_matrix, text_auto=True, title="Correlation Map", template="plotly_white", color_continuous_scale="Blues")
-            fig.update_layout(hovermode="x unified", font=dict(color="#1e2a44"))
-            st.plotly_chart(fig, use_container_width=True)
+            corr_matrix = correlation_matrix(file_bytes, is_csv, method)
+            st.plotly_chart(build_corr_fig(corr_matrix), use_container_width=True)
         
         # Visualizations
-        if not numeric_columns.empty:
-            st.subheader("🌌 Galactic Visualizations")
-            selected_column = st.selectbox("Select data singularity", numeric_columns)
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                fig = px.histogram(
-                    df_cleaned, x=selected_column, nbins=50, title=f"📊 {selected_column} Nebula Histogram", 
-                    template="plotly_white", color_discrete_sequence=["#a1c4fd"]
-                )
-                fig.update_layout(bargap=0.1, hovermode="x unified", font=dict(color="#1e2a44"))
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                fig = px.box(
-                    df_cleaned, y=selected_column, title=f"📦 {selected_column} Quantum Flux", 
-                    template="plotly_white", color_discrete_sequence=["#c3e0ff"]
-                )
-                fig.update_layout(font=dict(color="#1e2a44"))
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col3:
-                fig = px.line(
-                    df_cleaned, y=selected_column, title=f"📈 {selected_column} Temporal Rift", 
-                    template="plotly_white", markers=True, color_discrete_sequence=["#ffcc99"]
-                )
-                fig.update_layout(font=dict(color="#1e2a44"))
-                st.plotly_chart(fig, use_container_width=True)
-            
-            # Scatter plot
-            if st.checkbox("Engage Scatter Warp"):
-                x_col = st.selectbox("X-axis singularity", numeric_columns)
-                y_col = st.selectbox("Y-axis singularity", numeric_columns, index=1)
-                fig = px.scatter(
-                    df_cleaned, x=x_col, y=y_col, title=f"Warp Field: {x_col} vs {y_col}", 
-                    template="plotly_white", color_discrete_sequence=["#c3e0ff"], 
-                    animation_frame=None if 'Date' not in df_cleaned.columns else 'Date'
-                )
-                fig.update_layout(font=dict(color="#1e2a44"))
-                st.plotly_chart(fig, use_container_width=True)
-            
-            # Outlier detection
-            if st.checkbox("Probe for Cosmic Anomalies"):
-                outliers = detect_outliers(df_cleaned, selected_column)
-                st.write(f"Anomalies in {selected_column}:")
-                if not outliers.empty:
-                    st.write(outliers)
-                else:
-                    st.write("No anomalies detected in this singularity.")
-            
-            # Quartile visualization
-            st.subheader("📊 Stellar Quartile Array")
-            q1, q2, q3 = df_cleaned[selected_column].quantile([0.25, 0.5, 0.75])
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=["Q1", "Q2 (Core)", "Q3"], y=[q1, q2, q3], 
-                marker_color=["#a1c4fd", "#ffcc99", "#c3e0ff"], 
-                text=[f"{q1:.2f}", f"{q2:.2f}", f"{q3:.2f}"], textposition="auto"
-            ))
-            fig.update_layout(title=f"Quartile Array for {selected_column}", template="plotly_white", font=dict(color="#1e2a44"))
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # AI Integration
-        with st.expander("🤖 AI Core", expanded=False):
-            question = st.text_input("Query the neural core (e.g., 'What’s the trend in this singularity?')")
-            if question:
-                with st.spinner("🤖 Neural net engaging..."):
-                    time.sleep(1)
-                trend = "rising" if df_cleaned[selected_column].iloc[-1] > df_cleaned[selected_column].iloc[0] else "falling" if df_cleaned[selected_column].iloc[-1] < df_cleaned[selected_column].iloc[0] else "stable"
-                st.write(f"🧠 Response (Feb 24, 2025): Analyzing '{question}'. For {selected_column}, the temporal rift suggests a {trend} trend based on recent data shifts.")
+        if numeric_columns:
+            visualizations(df_cleaned, numeric_columns, file_bytes, is_csv, method)
         
         # Download section
-        export_format = st.selectbox("📤 Data Extraction Protocol", ["CSV", "Excel"])
-        export_data = convert_df(df_cleaned, format=export_format.lower())
+        export_format = st.selectbox("📤 Data Extraction Protocol", ["CSV", "Excel", "Parquet"])
+        export_format_map = {
+            "CSV": ("csv.gz", "application/gzip"),
+            "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+            "Parquet": ("parquet", "application/vnd.apache.parquet")
+        }
+        export_ext, export_mime = export_format_map[export_format]
+        export_data = export_cleaned(file_bytes, is_csv, method, format=export_format.lower())
         st.download_button(
             label=f"📥 Extract Data ({export_format})",
             data=export_data,
-            file_name=f"stabilized_data_{export_format.lower()}.{export_format.lower()}",
-            mime="text/csv" if export_format == "CSV" else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            file_name=f"stabilized_data.{export_ext}",
+            mime=export_mime,
             help="Extract stabilized data for intergalactic analysis."
         )
 